@@ -0,0 +1,230 @@
+"""
+AppleScript keyboard-simulation path for opening a Cursor chat (macOS only).
+
+Imported lazily by _cursor_chat._open_chat(), so other platforms never load
+it.
+"""
+import asyncio
+import contextlib
+import hashlib
+import os
+import subprocess
+
+import _cursor_chat
+from _cursor_chat import _run
+
+# Upper bounds on the osascript/osacompile runs. The chat script's own waits
+# add up to about 11s (most of it for a cold Cursor start); these only matter
+# when something like a macOS consent prompt holds it up, which would
+# otherwise stall the cursord.py daemon
+CHAT_SCRIPT_TIMEOUT = 15
+COMPILE_TIMEOUT = 10
+
+
+# Waits for Cursor to start and be frontmost, opens a new chat tab (Cmd+T)
+# and, when a prompt is passed as the first argument, pastes it and submits.
+# Activation runs alongside it (see ACTIVATE_APPLESCRIPT), so the wait covers
+# a cold Cursor start. The prompt goes through the clipboard so it lands with
+# one Cmd+V instead of a keystroke per character; it is copied before any
+# keys are sent so it can be pasted by hand if keystroke automation is not
+# permitted. Keys are only sent while Cursor is frontmost; otherwise the
+# script fails with -1712 (timed out) rather than typing into another app.
+CHAT_APPLESCRIPT = '''
+on cursorIsRunning()
+    tell application "System Events" to return exists process "Cursor"
+end cursorIsRunning
+
+on cursorIsFrontmost()
+    tell application "System Events"
+        try
+            return frontmost of process "Cursor"
+        on error number -1728
+            return false -- Not running (yet)
+        end try
+    end tell
+end cursorIsFrontmost
+
+on run argv
+    if (count of argv) > 0 then set the clipboard to (item 1 of argv)
+    -- Wait (up to 8s) for Cursor to start; a cold start can take a while
+    repeat 160 times
+        if my cursorIsRunning() then exit repeat
+        delay 0.05
+    end repeat
+    -- Then (up to 2s) for it to come to the front
+    repeat 40 times
+        if my cursorIsFrontmost() then exit repeat
+        delay 0.05
+    end repeat
+    if not my cursorIsFrontmost() then error "Cursor did not come to the front in time" number -1712
+    tell application "System Events"
+        tell process "Cursor"
+            set previousFocus to missing value
+            try
+                set previousFocus to value of attribute "AXFocusedUIElement"
+            end try
+            keystroke "t" using command down
+            if (count of argv) > 0 then
+                -- Wait (up to 1s) for the new chat's input to take focus
+                repeat 20 times
+                    try
+                        set focusedElement to value of attribute "AXFocusedUIElement"
+                        set focusedRole to role of focusedElement
+                        if focusedElement is not previousFocus and focusedRole is in {"AXTextArea", "AXTextField"} then exit repeat
+                    end try
+                    delay 0.05
+                end repeat
+                if not my cursorIsFrontmost() then error "Cursor is no longer frontmost" number -1712
+                keystroke "v" using command down
+                delay 0.01
+                key code 36
+            end if
+        end tell
+    end tell
+end run
+'''
+
+ACTIVATE_APPLESCRIPT = 'tell application "Cursor" to activate'
+
+# Compiled copy of CHAT_APPLESCRIPT, kept in a per-user directory and named
+# after the script it was built from, so an edit (or another copy of these
+# scripts) never runs a stale build
+COMPILED_SCRIPT_PATH = os.path.join(
+    os.path.expanduser('~/.cursor'),
+    f"cursor_chat-{hashlib.sha1(CHAT_APPLESCRIPT.encode()).hexdigest()[:12]}.scpt"
+)
+
+
+def _is_trusted(path: str) -> bool:
+    """Return whether path is owned by this user and writable only by them."""
+    st = os.stat(path)
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+async def chat_script_command() -> list:
+    """
+    Build the osascript command that runs the chat AppleScript.
+
+    Compiles CHAT_APPLESCRIPT with osacompile on first use so later runs skip
+    AppleScript parsing. A compiled copy that isn't trusted (see _is_trusted)
+    is rebuilt, and the source is run if compiling fails.
+    """
+    # Tool paths are read from _cursor_chat each time: cursord.py re-resolves
+    # them per request
+    osascript, osacompile = _cursor_chat._OSASCRIPT, _cursor_chat._OSACOMPILE
+    source_cmd = [osascript, '-e', CHAT_APPLESCRIPT]
+    if not osacompile:
+        return source_cmd
+    try:
+        try:
+            trusted = _is_trusted(COMPILED_SCRIPT_PATH)
+        except FileNotFoundError:
+            trusted = False
+        if not trusted:
+            os.makedirs(os.path.dirname(COMPILED_SCRIPT_PATH), mode=0o700, exist_ok=True)
+            # Build under a temporary name so a half-written file is never run
+            partial_path = f"{COMPILED_SCRIPT_PATH}.{os.getpid()}.tmp"
+            try:
+                returncode, _, _ = await _run(
+                    [osacompile, '-o', partial_path, '-e', CHAT_APPLESCRIPT],
+                    timeout=COMPILE_TIMEOUT
+                )
+                if returncode != 0:
+                    return source_cmd
+                os.chmod(partial_path, 0o600)
+                os.replace(partial_path, COMPILED_SCRIPT_PATH)
+            finally:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(partial_path)
+        return [osascript, COMPILED_SCRIPT_PATH]
+    except (OSError, asyncio.TimeoutError):
+        return source_cmd
+
+
+def _cursor_missing(activation: asyncio.Task) -> bool:
+    """Return whether the finished activation task failed to find Cursor."""
+    if not activation.done() or activation.cancelled() or activation.exception():
+        return False
+    returncode, _, stderr = activation.result()
+    return returncode != 0 and b"-1728" in stderr
+
+
+async def try_applescript(script_command: list, full_prompt: str = None, prefill: bool = False):
+    """
+    Activate Cursor and open the chat by simulating Cmd+T (and Cmd+V, Enter).
+    
+    Args:
+        script_command: osascript command from chat_script_command()
+        full_prompt: Optional prompt to paste and send
+        prefill: Whether to fall back to a pre-filled (unsent) chat when
+            keystrokes aren't permitted
+    
+    Returns:
+        True if the chat was opened (or Cursor was at least activated),
+        False if Cursor could not be activated, None to fall back to the CLI
+    """
+    cmd = list(script_command)
+    if full_prompt:
+        cmd.append(full_prompt)
+    
+    # Activation runs alongside the chat script, which waits for Cursor to
+    # start and come to the front by itself; it is only awaited to tell a
+    # missing Cursor (which fails it at once) from a slow start. Only stderr
+    # is read (for the checks below). It stays bytes: the success path never
+    # looks at it and the checks match on bytes, so it is only decoded when
+    # shown to the user
+    activation = asyncio.ensure_future(_run(
+        [_cursor_chat._OSASCRIPT, '-e', ACTIVATE_APPLESCRIPT],
+        timeout=CHAT_SCRIPT_TIMEOUT,
+        stderr=asyncio.subprocess.PIPE
+    ))
+    chat = asyncio.ensure_future(_run(
+        cmd,
+        timeout=CHAT_SCRIPT_TIMEOUT,
+        stderr=asyncio.subprocess.PIPE
+    ))
+    try:
+        await asyncio.wait({activation, chat}, return_when=asyncio.FIRST_COMPLETED)
+        if _cursor_missing(activation):
+            # The chat script is still waiting for Cursor and has sent no keys
+            print("⚠️  Could not activate Cursor. Is it installed?")
+            return False
+        
+        returncode, _, stderr = await chat
+        
+        if returncode == 0:
+            print("✅ Opened new chat in Cursor (using AppleScript)")
+            if full_prompt:
+                print(f"   Prompt: {full_prompt}")
+            return True
+        elif b"-1712" in stderr:
+            print("⚠️  Cursor did not start and come to the front in time")
+        elif b"not allowed to send keystrokes" in stderr or b"1002" in stderr:
+            # The deeplink needs no Accessibility permission
+            if full_prompt and prefill and await _cursor_chat._try_prefill(full_prompt):
+                print("   💡 Allow Accessibility access (System Settings → Privacy & Security)")
+                print("      to have prompts sent automatically")
+                return True
+            print("⚠️  macOS Accessibility Permission Required")
+            print("   To enable keystroke automation:")
+            print("   1. Open System Settings → Privacy & Security → Accessibility")
+            print("   2. Enable 'Terminal' or 'Python' (whichever you're using)")
+            print("   3. Or run this script from Terminal.app (it may already have permissions)")
+            print("\n   Alternatively, Cursor is now activated - press Cmd+T manually")
+            if full_prompt:
+                print(f"   Then paste the prompt (already on your clipboard): {full_prompt}")
+            return True  # Still activated Cursor, so partial success
+        else:
+            print(f"⚠️  AppleScript method failed: {stderr.decode(errors='replace')}")
+    except asyncio.TimeoutError:
+        print(f"⚠️  AppleScript method timed out after {CHAT_SCRIPT_TIMEOUT}s")
+        print("   Check for a macOS permission prompt waiting for an answer")
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"⚠️  AppleScript method failed: {e}")
+    finally:
+        # Whatever is still running by now has nothing left to do: activation
+        # once the chat script is done, the chat script once Cursor is gone
+        for task in (activation, chat):
+            task.cancel()
+        await asyncio.gather(activation, chat, return_exceptions=True)
+    return None
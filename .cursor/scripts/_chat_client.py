@@ -0,0 +1,173 @@
+"""
+Lightweight client side of the Cursor chat launcher.
+
+open_cursor_chat.py and run_new_agent.py only parse their arguments and hand
+the request to the cursord.py daemon over a UNIX socket, starting it on first
+use. The daemon keeps _cursor_chat.py (and its asyncio import) loaded between
+invocations, so this module deliberately imports nothing heavy.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import zlib
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Where cursord.py listens for chat requests. Each copy of these scripts gets
+# its own daemon (running its own code), keyed on the directory they live in;
+# crc32 only needs to tell copies apart and is far cheaper to import than
+# hashlib
+SOCKET_PATH = os.path.join(
+    os.path.expanduser('~/.cursor'),
+    f"chatd-{zlib.crc32(os.fsencode(SCRIPTS_DIR)):08x}.sock"
+)
+
+# How long to wait for a freshly started daemon to accept connections
+DAEMON_START_TIMEOUT = 2
+
+# How long a request may wait for the daemon to finish the ones ahead of it
+QUEUE_TIMEOUT = 300
+
+# Upper bound on handling a single request, once the daemon has started on
+# it (cursor-agent alone may take 5s)
+REQUEST_TIMEOUT = 30
+
+DAEMON_SCRIPT = os.path.join(SCRIPTS_DIR, 'cursord.py')
+
+
+def _send(request: bytes) -> dict:
+    """Send one request to the daemon and return its decoded reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(QUEUE_TIMEOUT)
+        conn.connect(SOCKET_PATH)
+        conn.sendall(request)
+        with conn.makefile('rb') as reply:
+            # The daemon acknowledges with an empty line once it starts on
+            # the request; only the handling is bounded by REQUEST_TIMEOUT,
+            # not the wait behind other requests
+            if reply.readline() != b'\n':
+                raise ValueError("no acknowledgement from the daemon")
+            conn.settimeout(REQUEST_TIMEOUT)
+            return json.loads(reply.readline())
+
+
+def _start_daemon():
+    """Start cursord.py detached from this process and its terminal."""
+    subprocess.Popen(
+        [sys.executable, DAEMON_SCRIPT],
+        cwd='/',
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+
+def _request(request: bytes) -> dict:
+    """Send a request, starting the daemon and retrying if it isn't running."""
+    try:
+        return _send(request)
+    except (ConnectionError, FileNotFoundError):
+        pass  # Not running (or a stale socket left behind)
+    
+    _start_daemon()
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while True:
+        try:
+            return _send(request)
+        except (ConnectionError, FileNotFoundError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.02)
+
+
+def submit(prompt: str = None, workspace: str = None, model: str = None,
+           prefill: bool = False) -> bool:
+    """
+    Open a new Cursor chat through the cursord.py daemon.
+    
+    Starts the daemon if it isn't running. If it can't be reached at all the
+    chat is opened in-process instead, so the daemon is purely a speed-up.
+    
+    Args:
+        prompt: Optional initial chat prompt/message
+        workspace: Optional workspace path to open (defaults to the cwd)
+        model: Optional model type to specify
+        prefill: Accept a chat with the prompt pre-filled but not sent
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    request = json.dumps({
+        'prompt': prompt,
+        'workspace': workspace,
+        # The methods run where they would in-process: in the client's cwd
+        'cwd': os.getcwd(),
+        'model': model,
+        'prefill': prefill,
+        # The daemon may have been started by another client; it serves
+        # each request with the requesting client's environment
+        'env': dict(os.environ),
+    }).encode() + b'\n'
+    
+    if hasattr(socket, 'AF_UNIX'):
+        try:
+            reply = _request(request)
+        except (socket.timeout, ValueError):
+            # The daemon took the request but never answered properly; don't
+            # retry in-process or the chat could be opened twice
+            print("⚠️  Cursor chat daemon did not reply")
+            return False
+        except OSError:
+            pass  # Daemon unavailable, open the chat in-process below
+        else:
+            sys.stdout.write(reply['output'])
+            return reply['ok']
+    
+    from _cursor_chat import open_chat
+    return open_chat(prompt, workspace, model, prefill)
+
+
+def parse_args(argv: list, options: dict, usage: str, choices: dict = None) -> dict:
+    """
+    Parse command-line options without argparse.
+
+    argparse (and the gettext/textwrap imports it pulls in) dominates the
+    start-up time of these short-lived scripts, and they only take a few
+    flags each.
+    
+    Args:
+        argv: Arguments to parse (usually sys.argv[1:])
+        options: Map of each flag ('-p', '--prompt', ...) to its result key
+        usage: Help text printed for -h/--help (its first paragraph on errors)
+        choices: Optional map of result key -> allowed values
+    
+    Returns:
+        dict: Result key -> value (None for options not given)
+    """
+    args = dict.fromkeys(options.values())
+    usage_line = usage.split('\n\n', 1)[0]
+    i = 0
+    while i < len(argv):
+        flag, sep, value = argv[i].partition('=')
+        if flag in ('-h', '--help'):
+            print(usage)
+            sys.exit(0)
+        if flag not in options or (sep and not flag.startswith('--')):
+            print(f"{usage_line}\nerror: unrecognized argument: {argv[i]}", file=sys.stderr)
+            sys.exit(2)
+        if not sep:
+            i += 1
+            if i == len(argv):
+                print(f"{usage_line}\nerror: argument {flag}: expected a value", file=sys.stderr)
+                sys.exit(2)
+            value = argv[i]
+        if choices and options[flag] in choices and value not in choices[options[flag]]:
+            print(f"{usage_line}\nerror: argument {flag}: invalid choice: {value!r}", file=sys.stderr)
+            sys.exit(2)
+        args[options[flag]] = value
+        i += 1
+    return args
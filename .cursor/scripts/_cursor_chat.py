@@ -0,0 +1,290 @@
+"""
+Shared helpers for opening a new Cursor chat programmatically.
+
+Runs inside the cursord.py daemon (and in-process when the daemon can't be
+reached). open_chat() tries
+1. cursor-agent CLI (if available and prompt provided)
+2. AppleScript keyboard simulation, then the Cursor URL scheme where a
+   pre-filled (unsent) prompt is acceptable (macOS)
+3. Basic cursor CLI
+in order, each only once the previous one has failed.
+"""
+import asyncio
+import contextlib
+import os
+import shutil
+import signal
+import subprocess
+import sys
+
+# Deeplink that opens a new chat pre-filled with the given prompt; it does
+# not send it, so it only stands in for AppleScript when the caller allows
+CURSOR_PROMPT_URL = 'cursor://anysphere.cursor-deeplink/prompt?text='
+
+# How long cursor-agent gets before it is abandoned (and killed, along with
+# anything it started)
+CURSOR_AGENT_TIMEOUT = 5
+
+# Longer prompts reach cursor-agent through a file instead of argv, well
+# below the per-argument limit (128 KiB on Linux) and macOS's ARG_MAX
+MAX_ARGV_PROMPT = 64 * 1024
+
+_IS_MACOS = sys.platform == 'darwin'
+
+# Keyword arguments that keep subprocess on its posix_spawn() fast path
+# (see _run); shared by every spawn on the launch path
+_SPAWN_KWARGS = {'close_fds': False}
+
+
+def resolve_tools():
+    """
+    Look up the external tools on the current PATH.
+    
+    Done once at import, so missing tools are skipped without a spawn, and
+    again by cursord.py for each request it serves with a client's PATH.
+    """
+    global _CURSOR_AGENT, _CURSOR_CLI, _OSASCRIPT, _OSACOMPILE, _OPEN
+    _CURSOR_AGENT = shutil.which('cursor-agent')
+    _CURSOR_CLI = shutil.which('cursor')
+    _OSASCRIPT = shutil.which('osascript')
+    _OSACOMPILE = shutil.which('osacompile')
+    _OPEN = shutil.which('open')
+
+
+resolve_tools()
+
+
+async def _run(cmd: list, timeout: float = None,
+               stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+               new_session: bool = False):
+    """
+    Run a command to completion without blocking the event loop.
+    
+    The process is killed if the timeout expires or the awaiting task is
+    cancelled. Only the process itself is, unless new_session is set: then
+    it leads its own process group and the whole group is killed, taking
+    any children it started along with it.
+    
+    Output is discarded unless PIPE is passed for a stream that is actually
+    read: pipes cost extra descriptors and buffering, and a child left behind
+    holding one would make waiting for the killed process wait for it too.
+    
+    Spawns take CPython's posix_spawn() path instead of the slower fork+exec
+    one, which subprocess only picks when the executable is given as a path
+    (hence the cached shutil.which() results), close_fds is False (safe: our
+    own descriptors are non-inheritable) and there is no cwd, preexec_fn,
+    pass_fds, start_new_session, user/group or umask change. Keep it that
+    way; new_session gives it up, so reserve it for commands that need it.
+    
+    Args:
+        cmd: Command and arguments
+        timeout: Seconds to wait before killing the process
+        stdout, stderr: DEVNULL (default) or PIPE
+        new_session: Run the process in a new session and process group
+    
+    Returns:
+        tuple: (returncode, stdout bytes or None, stderr bytes or None)
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=stdout,
+        stderr=stderr,
+        start_new_session=new_session,
+        **_SPAWN_KWARGS
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    finally:
+        if proc.returncode is None:
+            # os.kill rather than proc.kill(): Popen.send_signal() polls first,
+            # reaping an already-exited child behind asyncio's child watcher
+            with contextlib.suppress(ProcessLookupError):
+                if new_session:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                else:
+                    os.kill(proc.pid, signal.SIGKILL)
+            await proc.wait()
+    return proc.returncode, stdout, stderr
+
+
+async def _try_url_scheme(prompt: str) -> bool:
+    """
+    Open a new Cursor chat pre-filled with the prompt via Cursor's URL scheme (macOS).
+
+    The prompt is left in the chat input for the user to send; `open` exits 0
+    as soon as a handler accepts the URL, whether or not Cursor acted on it.
+
+    Returns:
+        bool: True if a handler accepted the URL, False otherwise
+    """
+    # Imported here so script start-up doesn't pay for it on other paths
+    import urllib.parse
+    
+    if not _OPEN:
+        return False
+    url = CURSOR_PROMPT_URL + urllib.parse.quote(prompt, safe='')
+    try:
+        returncode, _, _ = await _run([_OPEN, url], timeout=2)
+        return returncode == 0
+    except (OSError, asyncio.TimeoutError):
+        # OSError covers a missing `open` and a URL too long for argv
+        return False
+
+
+async def _try_prefill(full_prompt: str) -> bool:
+    """
+    Open a new chat with the prompt pre-filled (URL scheme) and say so.
+    
+    The deeplink can't send the prompt, so callers only use it where that
+    is acceptable (prefill), and it is never reported as a run.
+    """
+    if not await _try_url_scheme(full_prompt):
+        return False
+    print("✅ Opened new chat in Cursor with the prompt pre-filled (using URL scheme)")
+    print("   💡 Press Enter to send it")
+    return True
+
+
+async def _try_cursor_agent(full_prompt: str, model: str = None):
+    """
+    Open the chat with the cursor-agent CLI.
+    
+    The prompt is passed as cursor-agent's positional prompt argument. One
+    longer than MAX_ARGV_PROMPT is written to a private temporary file that
+    a short prompt points the agent at (as an @ file reference), so a long
+    prompt costs nothing extra at exec time and never runs into ARG_MAX.
+
+    Returns:
+        True if cursor-agent succeeded, None to let other methods handle it
+    """
+    prompt_path = None
+    try:
+        if len(full_prompt) > MAX_ARGV_PROMPT:
+            # Imported here so the common case doesn't pay for it
+            import tempfile
+            fd, prompt_path = tempfile.mkstemp(prefix='cursor_prompt_', suffix='.txt')
+            with open(fd, 'w', encoding='utf-8') as prompt_file:
+                prompt_file.write(full_prompt)
+            full_prompt = f"Follow the instructions in @{prompt_path}"
+        cmd = [_CURSOR_AGENT, '-p', full_prompt]
+        if model:
+            cmd.extend(['-m', model])
+        # Its own process group, so a timeout also kills whatever it spawned
+        returncode, _, _ = await _run(
+            cmd,
+            timeout=CURSOR_AGENT_TIMEOUT,
+            new_session=True
+        )
+        if returncode == 0:
+            print("✅ Opened chat with cursor-agent CLI")
+            return True
+    except (OSError, asyncio.TimeoutError):
+        pass  # cursor-agent missing, not runnable or hung, try next method
+    finally:
+        # cursor-agent has exited (or been killed) by now
+        if prompt_path:
+            with contextlib.suppress(OSError):
+                os.unlink(prompt_path)
+    return None
+
+
+async def _try_macos(full_prompt: str = None, script_command=None, prefill: bool = False):
+    """
+    Open the chat via AppleScript, falling back to the URL scheme (macOS).
+
+    Args:
+        full_prompt: Optional prompt to send in the new chat
+        script_command: Task building the chat AppleScript command (see
+            _open_chat), or None if osascript isn't available
+        prefill: Whether a chat with the prompt pre-filled but not sent is
+            an acceptable fallback when AppleScript can't send it
+
+    Returns:
+        True if the chat was opened (or Cursor was at least activated),
+        False if Cursor could not be activated, None to fall back to the CLI
+    """
+    if script_command is not None:
+        from _applescript import try_applescript
+        outcome = await try_applescript(await script_command, full_prompt, prefill)
+        if outcome is not None:
+            return outcome
+
+    if full_prompt and prefill and await _try_prefill(full_prompt):
+        return True
+    return None
+
+
+async def _open_chat(full_prompt: str = None, model: str = None, prefill: bool = False):
+    """
+    Open the chat with cursor-agent, then with the macOS methods.
+    
+    The macOS methods only start once cursor-agent has failed: both act on
+    Cursor, and one abandoned halfway could leave a stray tab or a clobbered
+    clipboard behind. What can overlap, building the AppleScript command
+    (compiling it on first use), runs while cursor-agent does. The AppleScript
+    path lives in _applescript.py and is only imported here, so other
+    platforms never load it.
+    
+    Returns:
+        True if a method opened the chat, False if one failed definitively,
+        None to fall back to the CLI
+    """
+    script_command = None
+    if _IS_MACOS and _OSASCRIPT:
+        from _applescript import chat_script_command
+        script_command = asyncio.create_task(chat_script_command())
+    
+    if full_prompt and _CURSOR_AGENT and await _try_cursor_agent(full_prompt, model):
+        if script_command is not None:
+            await script_command  # Let a first-use compile finish, not be killed
+        return True
+    if _IS_MACOS:
+        return await _try_macos(full_prompt, script_command, prefill)
+    return None
+
+
+def open_chat(prompt: str = None, workspace: str = None, model: str = None,
+              prefill: bool = False):
+    """
+    Try to open Cursor chat using best available method.
+    
+    cursor-agent (if available) goes first, then the macOS methods; the
+    basic cursor CLI is the fallback when none of them opens the chat.
+    
+    Args:
+        prompt: Optional initial chat prompt/message
+        workspace: Optional workspace path to open
+        model: Optional model type to specify
+        prefill: Accept a new chat with the prompt pre-filled but not sent
+            (the URL scheme) when it can't be sent
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    # Construct full prompt with model specification if provided
+    full_prompt = prompt
+    if model and prompt:
+        full_prompt = f"{prompt} (model: {model})"
+    elif model:
+        full_prompt = f"(model: {model})"
+    
+    if (full_prompt and _CURSOR_AGENT) or _IS_MACOS:
+        outcome = asyncio.run(_open_chat(full_prompt, model, prefill))
+        if outcome is not None:
+            return outcome
+    
+    # Last resort: just open Cursor (user will need to manually open chat)
+    workspace_path = workspace or os.getcwd()
+    if _CURSOR_CLI:
+        subprocess.run([_CURSOR_CLI, os.fspath(workspace_path)], check=False, **_SPAWN_KWARGS)
+        print("✅ Opened Cursor")
+        if not full_prompt:
+            print("   💡 Press Cmd+T to open a new chat")
+        else:
+            print(f"   💡 Press Cmd+T and paste: {full_prompt}")
+        return True
+    else:
+        print("❌ Cursor CLI not found.")
+        print("   Install it with: curl https://cursor.com/install -fsS | bash")
+        print("   Or use AppleScript method (macOS only)")
+        return False
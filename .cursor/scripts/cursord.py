@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Background daemon that opens Cursor chats on behalf of the launcher scripts.
+
+open_cursor_chat.py and run_new_agent.py start this on first use (see
+_chat_client.py) and then just send it requests, so the interpreter start-up,
+imports and tool lookups in _cursor_chat.py are paid once instead of per
+chat. Requests are handled one at a time and each is answered before the next
+is accepted, so chained launches never interleave their keystrokes. Each copy
+of these scripts runs its own daemon (see _chat_client.SOCKET_PATH).
+
+Protocol: one JSON line per connection, {"prompt", "workspace", "model",
+"prefill", "env", "cwd"}, acknowledged with an empty line when the daemon
+starts on it and answered with one JSON line {"ok": bool, "output": str}.
+
+The daemon exits after IDLE_TIMEOUT seconds without requests; run it directly
+to debug:
+    python3 .cursor/scripts/cursord.py
+"""
+import contextlib
+import fcntl
+import io
+import json
+import os
+import socket
+import sys
+import traceback
+
+import _chat_client
+import _cursor_chat
+from _chat_client import REQUEST_TIMEOUT, SOCKET_PATH
+from _cursor_chat import open_chat, resolve_tools
+
+# Exit after this many seconds without a request
+IDLE_TIMEOUT = 600
+
+# Held for the daemon's lifetime so only one instance serves the socket
+LOCK_PATH = SOCKET_PATH + '.lock'
+
+# Source files whose modification makes the daemon exit so the next launch
+# runs the updated code
+SOURCES = [
+    __file__,
+    _chat_client.__file__,
+    _cursor_chat.__file__,
+    os.path.join(os.path.dirname(_cursor_chat.__file__), '_applescript.py'),
+]
+
+
+def _sources_mtime() -> float:
+    """Return the newest modification time of the daemon's source files."""
+    return max(os.stat(path).st_mtime for path in SOURCES)
+
+
+def _adopt_environment(env: dict):
+    """
+    Make env the daemon's environment, as if it had been started by the client.
+    
+    Requests are served one at a time, so replacing os.environ is safe, and
+    every spawn inherits it (keeping them on the posix_spawn() path). The
+    tools are then looked up again on the client's PATH.
+    """
+    os.environ.clear()
+    os.environ.update(env)
+    resolve_tools()
+    # tempfile caches the temporary directory (from TMPDIR) on first use
+    if 'tempfile' in sys.modules:
+        sys.modules['tempfile'].tempdir = None
+
+
+def handle(conn: socket.socket):
+    """Read one request from the connection, open the chat and reply."""
+    # A client that gave up while its request was queued has closed its end,
+    # so this fails (EPIPE) and the request is dropped instead of opening a
+    # chat the client already reported as failed
+    conn.sendall(b'\n')
+    
+    output = io.StringIO()
+    try:
+        with conn.makefile('rb') as reader:
+            request = json.loads(reader.readline())
+        _adopt_environment(request['env'])
+        # Run the methods from the client's cwd, as they would be in-process
+        # (the workspace is only what the cursor CLI fallback opens).
+        # Requests are served one at a time, so changing the daemon's own
+        # directory is safe, and unlike passing cwd= to each spawn it keeps
+        # them on the posix_spawn() path
+        os.chdir(request['cwd'])
+        with contextlib.redirect_stdout(output):
+            ok = open_chat(
+                request.get('prompt'),
+                request.get('workspace'),
+                request.get('model'),
+                request.get('prefill', False)
+            )
+    except Exception:
+        output.write(f"❌ cursord failed to handle the request:\n{traceback.format_exc()}")
+        ok = False
+    
+    reply = json.dumps({'ok': bool(ok), 'output': output.getvalue()})
+    conn.sendall(reply.encode() + b'\n')
+
+
+def serve():
+    """
+    Serve chat requests on SOCKET_PATH.
+    
+    Exits after IDLE_TIMEOUT seconds without a request, or after a request
+    once any of SOURCES has changed since start-up.
+    """
+    started_mtime = _sources_mtime()
+    os.makedirs(os.path.dirname(SOCKET_PATH), exist_ok=True)
+    
+    lock = open(LOCK_PATH, 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return  # Another daemon is already serving
+    
+    # Clear a socket left behind by a daemon that didn't shut down cleanly
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(SOCKET_PATH)
+    
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        # Create the socket owner-only from the start; chmod() after bind()
+        # would leave it briefly open to anyone
+        old_umask = os.umask(0o077)
+        try:
+            server.bind(SOCKET_PATH)
+        finally:
+            os.umask(old_umask)
+        server.listen()
+        server.settimeout(IDLE_TIMEOUT)
+        try:
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    break
+                with conn, contextlib.suppress(OSError):
+                    # A client that vanished mid-request must not stop the daemon
+                    conn.settimeout(REQUEST_TIMEOUT)
+                    handle(conn)
+                if _sources_mtime() != started_mtime:
+                    break
+        finally:
+            os.unlink(SOCKET_PATH)
+            lock.close()
+
+
+if __name__ == '__main__':
+    serve()